@@ -2,128 +2,229 @@ import gymnasium as gym
 from stable_baselines3 import DQN
 from stable_baselines3.common.env_checker import check_env
 from stable_baselines3.common.callbacks import CheckpointCallback
+from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import DummyVecEnv
+import numpy as np
+import torch
 import os
 
 # import the wordle environment
-from wordle_env import WordleEnv
+from wordle_env import WordleEnv, build_feedback_table, load_word_codes, share_feedback_table, sort_by_letter_frequency
 
 # including txt file with words
 try:
-    with open("183_words.txt", "r", encoding="utf-8") as file:
-        # loading the words and filtering only the 5 letter ones just in case
-        words_list = {line.strip().lower() for line in file if len(line.strip()) == 5}
+    # the 5 letter words as letter codes, cached in 183_words_5.npy after the first run
+    # and memory-mapped, so every environment shares the same array
+    WORD_CODES = load_word_codes("183_words.txt", word_length=5)
 except FileNotFoundError:
     print("Error: file not found")
     exit()
 
-if not words_list:
+if len(WORD_CODES) == 0:
     print("Error")
     exit()
-    
-CUSTOM_WORDS = list(words_list)
+
+# which action is which word: "alphabetical" (what the bundled model was trained with)
+# or "frequency", words made of common letters get the first actions, a better prior for a new model
+WORD_ORDER = "alphabetical"
+if WORD_ORDER not in ("alphabetical", "frequency"):
+    print(f"Error: unknown WORD_ORDER {WORD_ORDER}")
+    exit()
+if WORD_ORDER == "frequency":
+    WORD_CODES = sort_by_letter_frequency(WORD_CODES)
 
 
 # environment and model
 LOG_DIR = "wordle_logs"
-MODEL_PATH = "dqn_wordle_model"
+# a model only works with the word order it was trained with, so other orders get their own files
+# (the bundled dqn_wordle_model.zip is the alphabetical one)
+MODEL_NAME = "wordle_model" if WORD_ORDER == "alphabetical" else f"wordle_model_{WORD_ORDER}"
+MODEL_PATH = f"dqn_{MODEL_NAME}"
+N_ENVS = 8 # games played in parallel, so the network predicts a whole batch at once
+# jit-compile the q-networks for training (needs a c++ toolchain, set to False if torch.compile doesn't work on your machine).
+# evaluating a loaded model isn't compiled, a few dozen small forward passes don't pay back the compile time
+USE_TORCH_COMPILE = True
 os.makedirs(LOG_DIR, exist_ok=True)
 
-# creating the environment
-env = WordleEnv(custom_words=CUSTOM_WORDS, word_length=5, max_guesses=6)
-
-
-# callback to save the model during training
-# this saves a backup every 100k steps so i don't lose everything if it crashes
-checkpoint_callback = CheckpointCallback(
-    save_freq=100_000,
-    save_path=LOG_DIR,
-    name_prefix="wordle_model"
-)
-
-# defining the dqn model. using "MultiInputPolicy" because our observation space is a dictionary
-model = DQN(
-    "MultiInputPolicy",
-    env,
-    verbose=1,
-    tensorboard_log=LOG_DIR,
-    buffer_size=50000,
-    learning_rate=1e-4, # learning rate is low to be stable (0.0001)
-    batch_size=64,
-    learning_starts=1000,
-    gamma=0.99,
-    train_freq=4,
-    gradient_steps=1,
-    target_update_interval=1000,
-    exploration_fraction=0.1, # explore 10% of the time at first
-    exploration_final_eps=0.05,
-)
-
-if not os.path.exists(MODEL_PATH + ".zip"):
-    # train the agent
-    print("Starting training...")
+# the feedback table is computed once here and shared with every environment,
+# they only get the name of the shared memory block (works for SubprocVecEnv workers too)
+FEEDBACK_TABLE = share_feedback_table(build_feedback_table(WORD_CODES), WORD_CODES)
+
+def make_env(render_mode=None, monitor=True):
+    """Returns a function that builds one wordle environment (used by the vectorized env)"""
+    table_name = FEEDBACK_TABLE.name
+    def _init():
+        env = WordleEnv(word_codes=WORD_CODES, word_length=5, max_guesses=6, render_mode=render_mode,
+                        shared_table_name=table_name)
+        # the monitor wrapper keeps the episode reward/length logging during training
+        return Monitor(env) if monitor else env
+    return _init
+
+def compile_q_nets(model):
+    """Swaps the model's q-network and target network for torch.compile'd versions (used for training).
+    Only the training aliases are wrapped, model.policy is left as it is
+    so saving and loading the model work the same as before"""
+    if USE_TORCH_COMPILE:
+        # only the gradient updates in DQN.train call these (batches of 64). collecting rollouts goes
+        # through model.policy.predict, which uses the uncompiled policy.q_net.
+        # mode="default" doesn't use cuda graphs, so it doesn't depend on a fixed batch size
+        model.q_net = torch.compile(model.q_net, mode="default")
+        model.q_net_target = torch.compile(model.q_net_target, mode="default")
+
+try:
+    # creating the environment
+    env = DummyVecEnv([make_env() for _ in range(N_ENVS)])
+
+
+    # callback to save the model during training
+    # this saves a backup every 100k steps so i don't lose everything if it crashes
+    # (save_freq counts vectorized steps, each of them is N_ENVS env steps)
+    checkpoint_callback = CheckpointCallback(
+        save_freq=max(100_000 // N_ENVS, 1),
+        save_path=LOG_DIR,
+        name_prefix=MODEL_NAME
+    )
+
     TOTAL_TIMESTEPS = 500_000
-    try:
-        model.learn(
-            total_timesteps=TOTAL_TIMESTEPS,
-            callback=checkpoint_callback,
-            log_interval=100 # training progress every 100 episodes
+    trained_this_run = False
+
+    if not os.path.exists(MODEL_PATH + ".zip"):
+        # defining the dqn model. using "MultiInputPolicy" because our observation space is a dictionary
+        model = DQN(
+            "MultiInputPolicy",
+            env,
+            verbose=1,
+            tensorboard_log=LOG_DIR,
+            buffer_size=50000,
+            learning_rate=1e-4, # learning rate is low to be stable (0.0001)
+            batch_size=64,
+            learning_starts=1000,
+            gamma=0.99,
+            # train_freq counts vectorized steps (N_ENVS transitions each), so doing N_ENVS
+            # gradient steps keeps the original rate of one update every 4 transitions
+            train_freq=4,
+            gradient_steps=N_ENVS,
+            target_update_interval=1000,
+            exploration_fraction=0.1, # explore 10% of the time at first
+            exploration_final_eps=0.05,
+        )
+        compile_q_nets(model)
+
+        # train the agent
+        print("Starting training...")
+        try:
+            model.learn(
+                total_timesteps=TOTAL_TIMESTEPS,
+                callback=checkpoint_callback,
+                log_interval=100 # training progress every 100 episodes
+            )
+            # to save the final model
+            model.save(MODEL_PATH)
+            print(f"Training complete, model saved")
+        except KeyboardInterrupt:
+            model.save(MODEL_PATH + "_interrupted")
+            print(f"Training interrupted, model saved as interrupted")
+        # the trained model is already in memory, so it is evaluated as it is
+        trained_this_run = True
+
+
+    if not trained_this_run:
+        # models saved before the observations were switched to uint8 store an int32 observation space,
+        # the values and the network are the same so the current space is passed in instead
+        # evaluation only needs the network: it runs on the cpu (no cuda start-up for such a small net)
+        # and the replay buffer is kept to a single transition instead of allocating all 50k
+        load_kwargs = dict(
+            env=env,
+            device="cpu",
+            custom_objects={"observation_space": env.observation_space},
+            buffer_size=1,
         )
-        # to save the final model
-        model.save(MODEL_PATH)
-        print(f"Training complete, model saved")
-    except KeyboardInterrupt:
-        model.save(MODEL_PATH + "_interrupted")
-        print(f"Training interrupted, model saved as interrupted")
-
 
-# to load the trained model
-try:
-    model = DQN.load(MODEL_PATH, env=env)
-except FileNotFoundError:
-    print(f"Could not find model")
-    # fallback to load a checkpoint if the main file isn't there
-    model = DQN.load(f"{LOG_DIR}/wordle_model_{TOTAL_TIMESTEPS}_steps.zip", env=env)
-
-
-# set the render_mode on the environment for evaluation
-env.render_mode = "human"
-num_episodes = 100 # number of games to play
-total_wins = 0
-total_guesses_in_wins = 0
-
-for i in range(num_episodes):
-    obs, info = env.reset()
-    terminated = False
-    truncated = False
-    episode_reward = 0
-    num_guesses = 0
-
-    print(f"\n--- Episode {i+1} / {num_episodes} ---")
-    
-    while not terminated and not truncated:
-        # use deterministic=True for evaluation (agent picks best-known action)
-        action, _states = model.predict(obs, deterministic=True)
-        
-        obs, reward, terminated, truncated, info = env.step(int(action))
-        
-        episode_reward += reward
+        # to load the trained model
+        try:
+            model = DQN.load(MODEL_PATH, **load_kwargs)
+        except FileNotFoundError:
+            print(f"Could not find model")
+            # fallback to load a checkpoint if the main file isn't there
+            model = DQN.load(f"{LOG_DIR}/{MODEL_NAME}_{TOTAL_TIMESTEPS}_steps.zip", **load_kwargs)
+
+
+    # separate environment for evaluation, only the first game is rendered
+    # so the boards of the parallel games don't get mixed up in the terminal
+    eval_env = DummyVecEnv(
+        [make_env(render_mode="human", monitor=False)]
+        + [make_env(monitor=False) for _ in range(N_ENVS - 1)]
+    )
+    num_episodes = 100 # number of games to play
+    total_wins = 0
+    total_guesses_in_wins = 0
+    episodes_done = 0
+
+    # per-game counters, one slot for every parallel environment
+    episode_rewards = np.zeros(N_ENVS)
+    num_guesses = np.zeros(N_ENVS, dtype=int)
+    # every environment plays a fixed share of the games (like sb3's evaluate_policy), otherwise
+    # the quick wins would finish first and the long games still running at the end would be dropped
+    episode_counts = np.zeros(N_ENVS, dtype=int)
+    episode_targets = np.array([(num_episodes + i) // N_ENVS for i in range(N_ENVS)], dtype=int)
+
+    # evaluation mode for the policy (what model.predict would do on every call)
+    model.policy.set_training_mode(False)
+
+    obs = eval_env.reset()
+    while (episode_counts < episode_targets).any():
+        # greedy action straight from the q-network, one forward pass for all the parallel games
+        # (same as model.predict(obs, deterministic=True) without its per-call preprocessing)
+        obs_tensor = {key: torch.as_tensor(value, device=model.device) for key, value in obs.items()}
+        with torch.no_grad():
+            actions = model.q_net(obs_tensor).argmax(dim=1).cpu().numpy()
+
+        # finished games are reset automatically by the vectorized env
+        obs, rewards, dones, infos = eval_env.step(actions)
+
+        episode_rewards += rewards
         num_guesses += 1
 
-        if terminated:
-            if reward == 1.0: # win condition
+        for i in np.flatnonzero(dones):
+            if episode_counts[i] == episode_targets[i]:
+                continue # this environment already played its share
+            episode_counts[i] += 1
+            episodes_done += 1
+            info = infos[i]
+
+            # the rendered game's board is drawn when the game ends (inside eval_env.step),
+            # so its result comes right after it
+            if i == 0:
+                print(f"--- Episode {episodes_done} / {num_episodes} (board above) ---")
+            else:
+                print(f"\n--- Episode {episodes_done} / {num_episodes} ---")
+            if rewards[i] == 1.0: # win condition
                 print(f"WIN! Secret word was: {info['secret_word'].upper()}")
-                print(f"Solved in {num_guesses} guesses.")
+                print(f"Solved in {num_guesses[i]} guesses.")
                 total_wins += 1
-                total_guesses_in_wins += num_guesses
+                total_guesses_in_wins += num_guesses[i]
             else: # lose condition
                 print(f"LOSE! Secret word was: {info['secret_word'].upper()}")
-            print(f"Total Reward: {episode_reward:.2f}")
-
-# calculating final stats
-win_rate = (total_wins / num_episodes) * 100
-avg_guesses = (total_guesses_in_wins / total_wins) if total_wins > 0 else 0
-print(f"Win Rate: {win_rate:.1f}% ({total_wins} / {num_episodes})")
-if avg_guesses > 0:
-    print(f"Average Guesses (on wins): {avg_guesses:.2f}")
-
-env.close()
\ No newline at end of file
+            print(f"Total Reward: {episode_rewards[i]:.2f}")
+
+            episode_rewards[i] = 0
+            num_guesses[i] = 0
+
+        # the rendered environment stops drawing once it played its share,
+        # its extra games aren't counted so their boards would have no result
+        if episode_counts[0] == episode_targets[0]:
+            eval_env.set_attr("render_mode", None, indices=0)
+
+    # calculating final stats
+    win_rate = (total_wins / num_episodes) * 100
+    avg_guesses = (total_guesses_in_wins / total_wins) if total_wins > 0 else 0
+    print(f"Win Rate: {win_rate:.1f}% ({total_wins} / {num_episodes})")
+    if avg_guesses > 0:
+        print(f"Average Guesses (on wins): {avg_guesses:.2f}")
+
+    eval_env.close()
+    env.close()
+finally:
+    # freeing the shared feedback table, also when training or evaluation fails
+    FEEDBACK_TABLE.close()
+    FEEDBACK_TABLE.unlink()
\ No newline at end of file
@@ -1,8 +1,11 @@
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
-from collections import Counter
+from numba import njit
+from multiprocessing.shared_memory import SharedMemory
 import random
+import os
+import sys
 
 # ANSI color codes for rendering
 class bcolors:
@@ -12,6 +15,132 @@ class bcolors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# feedback values, shared by the compiled scorer and the environment
+_EMPTY = 0
+_GRAY = 1
+_YELLOW = 2
+_GREEN = 3
+
+
+@njit(cache=True)
+def _score(guess, secret, out):
+    """Writes the feedback of guess against secret into out.
+    guess, secret and out are uint8 arrays of the same length, letters are 0-25"""
+    counts = np.zeros(26, dtype=np.int8)
+    for i in range(secret.shape[0]):
+        counts[secret[i]] += 1
+
+    # pass for greens
+    for i in range(guess.shape[0]):
+        if guess[i] == secret[i]:
+            out[i] = _GREEN
+            counts[guess[i]] -= 1
+        else:
+            out[i] = _GRAY
+
+    # pass for yellows, grays stay as they are
+    for i in range(guess.shape[0]):
+        if out[i] != _GREEN and counts[guess[i]] > 0:
+            out[i] = _YELLOW
+            counts[guess[i]] -= 1
+
+
+@njit(cache=True)
+def _fill_feedback_table(word_codes, table):
+    """Scores every word against every other word, table[guess, secret] = feedback"""
+    for g in range(word_codes.shape[0]):
+        for s in range(word_codes.shape[0]):
+            _score(word_codes[g], word_codes[s], table[g, s])
+
+
+# compiling once at import so the first environment doesn't pay for it
+_fill_feedback_table(np.zeros((1, 5), dtype=np.uint8), np.zeros((1, 1, 5), dtype=np.uint8))
+
+
+def _check_word_codes(word_codes):
+    """Raises a ValueError if any letter code is outside 0-25 (the word had a character other than a-z)"""
+    if word_codes.size and word_codes.max() >= 26:
+        raise ValueError("Words can only contain the letters a-z.")
+
+
+def sort_by_letter_frequency(word_codes):
+    """Reorders words (rows of letter codes) so the ones made of the most common letters
+    come first, scored by the sum of the frequencies of their distinct letters.
+    Ties keep their original order"""
+    num_words = word_codes.shape[0]
+    letter_freq = np.bincount(word_codes.ravel(), minlength=26)
+    has_letter = np.zeros((num_words, 26), dtype=bool)
+    has_letter[np.arange(num_words)[:, None], word_codes] = True
+    scores = has_letter @ letter_freq
+    return word_codes[np.argsort(-scores, kind="stable")]
+
+
+def build_feedback_table(word_codes):
+    """Computes the feedback of every guess against every possible secret word.
+    Returns a read-only (num_words, num_words, word_length) array indexed by [guess, secret]"""
+    _check_word_codes(word_codes)
+    num_words, word_length = word_codes.shape
+    table = np.empty((num_words, num_words, word_length), dtype=np.uint8)
+    _fill_feedback_table(np.asarray(word_codes, dtype=np.uint8), table)
+    table.flags.writeable = False
+    return table
+
+
+# size of the (num_words, word_length) header at the start of a shared table block
+_SHARED_HEADER_BYTES = 16
+
+
+def share_feedback_table(table, word_codes):
+    """Copies a feedback table and the word codes it was built from into a new shared memory block,
+    so every environment (also in other processes) can use it with WordleEnv(shared_table_name=shm.name)
+    instead of computing its own. The caller owns the block and has to close() and unlink() it.
+    Layout: int64 header (num_words, word_length), then the word codes, then the table"""
+    num_words, word_length = word_codes.shape
+    if table.shape != (num_words, num_words, word_length):
+        raise ValueError("The feedback table doesn't match the word codes.")
+    shm = SharedMemory(create=True, size=_SHARED_HEADER_BYTES + word_codes.nbytes + table.nbytes)
+    header, codes, shared = _shared_table_views(shm, num_words, word_length)
+    header[:] = (num_words, word_length)
+    codes[:] = word_codes
+    shared[:] = table
+    return shm
+
+
+def _shared_table_views(shm, num_words, word_length):
+    """Returns the (header, word codes, table) arrays inside a block from share_feedback_table"""
+    codes_bytes = num_words * word_length
+    header = np.ndarray((2,), dtype=np.int64, buffer=shm.buf)
+    codes = np.ndarray((num_words, word_length), dtype=np.uint8, buffer=shm.buf, offset=_SHARED_HEADER_BYTES)
+    table = np.ndarray(
+        (num_words, num_words, word_length), dtype=np.uint8, buffer=shm.buf,
+        offset=_SHARED_HEADER_BYTES + codes_bytes
+    )
+    return header, codes, table
+
+
+def _words_to_codes(words, word_length):
+    """Converts a list of lowercase words into a (num_words, word_length) uint8 array of letters 0-25"""
+    if not all(w.isascii() and w.isalpha() for w in words):
+        raise ValueError("Words can only contain the letters a-z.")
+    return np.frombuffer(
+        "".join(words).encode("ascii"), dtype=np.uint8
+    ).reshape(len(words), word_length) - ord('a')
+
+
+def load_word_codes(path, word_length=5):
+    """Loads a word list file (one word per line) as a sorted, deduplicated
+    (num_words, word_length) uint8 array of letters 0-25.
+    The array is saved next to the file as .npy and memory-mapped on later runs,
+    so the text file is only parsed again when it changes"""
+    cache_path = f"{os.path.splitext(path)[0]}_{word_length}.npy"
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(path):
+        with open(path, "r", encoding="utf-8") as file:
+            # loading the words and filtering only the ones with the right length
+            words = sorted({line.strip().lower() for line in file if len(line.strip()) == word_length})
+        np.save(cache_path, _words_to_codes(words, word_length))
+    return np.load(cache_path, mmap_mode="r")
+
+
 class WordleEnv(gym.Env):
     """
     A Gymnasium environment for the game of Wordle.
@@ -31,30 +160,76 @@ class WordleEnv(gym.Env):
     metadata = {"render_modes": ["human"], "render_fps": 1}
 
     # define feedback values
-    EMPTY = 0
-    GRAY = 1
-    YELLOW = 2
-    GREEN = 3
+    EMPTY = _EMPTY
+    GRAY = _GRAY
+    YELLOW = _YELLOW
+    GREEN = _GREEN
 
-    def __init__(self, custom_words, word_length=5, max_guesses=6, render_mode=None):
+    def __init__(self, custom_words=None, word_length=5, max_guesses=6, render_mode=None, word_codes=None,
+                 shared_table_name=None):
+        """custom_words is a list of words to play with. Instead of it, word_codes can be
+        an already sorted and deduplicated array from load_word_codes, which is used as it is.
+        shared_table_name is the name of a shared memory block from share_feedback_table,
+        built from the same words, the environment then reads the feedback table from it"""
         super().__init__()
 
-        if not custom_words:
+        if not custom_words and word_codes is None:
             raise ValueError("custom_words list cannot be empty.")
             
         self.word_length = word_length
         self.max_guesses = max_guesses
         self.render_mode = render_mode
+        # printing is the slowest part of a rendered game, so by default
+        # the board is only drawn once the game is over
+        self._render_at_episode_end_only = True
+
+        if word_codes is not None:
+            # letters of every word as integers 0-25, one row per word
+            self.word_codes = np.asarray(word_codes, dtype=np.uint8)
+            if self.word_codes.ndim != 2 or self.word_codes.shape[1] != self.word_length:
+                raise ValueError(f"word_codes must have shape (num_words, {self.word_length}).")
+            _check_word_codes(self.word_codes)
+        else:
+            # making sure words are unique, lowercase and the right length
+            words = sorted(list(set(
+                [w.lower() for w in custom_words if len(w) == self.word_length]
+            )))
+            self.word_codes = _words_to_codes(words, self.word_length)
 
-        # making sure words are unique, lowercase and the right length
-        self.word_list = sorted(list(set(
-            [w.lower() for w in custom_words if len(w) == self.word_length]
-        )))
+        letters = (self.word_codes + ord('a')).tobytes().decode("ascii")
+        self.word_list = [
+            letters[i:i + self.word_length] for i in range(0, len(letters), self.word_length)
+        ]
         
         if not self.word_list:
             raise ValueError(f"No valid words of length {self.word_length} found in custom_words.")
 
         self.num_words = len(self.word_list)
+
+        # feedback for every (guess, secret) pair, so a step is a single lookup
+        self._shared_table = None
+        if shared_table_name is None:
+            self.feedback_table = self._build_feedback_table()
+        else:
+            # read-only view of the table another process (or ai.py) already computed
+            self._shared_table = SharedMemory(name=shared_table_name)
+            needed = _SHARED_HEADER_BYTES + self.word_codes.nbytes + self.num_words ** 2 * self.word_length
+            matches = False
+            if self._shared_table.size >= needed:
+                header, codes, table = _shared_table_views(self._shared_table, self.num_words, self.word_length)
+                # the table is only valid for exactly the same words in the same order
+                matches = (
+                    tuple(header) == (self.num_words, self.word_length)
+                    and np.array_equal(codes, self.word_codes)
+                )
+                del header, codes
+            if not matches:
+                table = None
+                self._shared_table.close()
+                self._shared_table = None
+                raise ValueError(f"Shared table {shared_table_name} wasn't built from these words.")
+            self.feedback_table = table
+            self.feedback_table.flags.writeable = False
         
         # define spaces for agent memory
         self.action_space = spaces.Discrete(self.num_words)
@@ -64,32 +239,56 @@ class WordleEnv(gym.Env):
         # 2. alphabet_status: which letters on the keyboard are green/yellow/gray
         # 3. guesses_remaining: how many turns are left
         self.observation_space = spaces.Dict({
-            "last_feedback": spaces.Box(low=0, high=3, shape=(self.word_length,), dtype=np.int32),
-            "alphabet_status": spaces.Box(low=0, high=3, shape=(26,), dtype=np.int32),
+            "last_feedback": spaces.Box(low=0, high=3, shape=(self.word_length,), dtype=np.uint8),
+            "alphabet_status": spaces.Box(low=0, high=3, shape=(26,), dtype=np.uint8),
             "guesses_remaining": spaces.Discrete(self.max_guesses + 1)
         })
 
+        # (terminated, reward) for every (guessed the word, was the last guess) pair
+        self._reward_table = {
+            (True, False): (True, 1.0),    # big reward for winning
+            (True, True): (True, 1.0),
+            (False, True): (True, -1.0),   # big penalty for losing
+            (False, False): (False, -0.1), # small penalty for each guess to encourage speed
+        }
+
+        # preformatted colored letters for rendering, indexed by [status][letter],
+        # used for both the guesses (gray/yellow/green) and the alphabet (also unused)
+        status_colors = ("", bcolors.GRAY, bcolors.YELLOW, bcolors.GREEN)
+        self._tiles = [
+            [f"{color}{self._int_to_letter(i).upper()}{bcolors.ENDC if color else ''} ".encode() for i in range(26)]
+            for color in status_colors
+        ]
+
         # game state variables
+        # last_feedback and alphabet_status are updated in place during a game,
+        # they are also the arrays handed out in the observation
         self.secret_word = ""
+        self.secret_idx = 0
         self.current_guess_count = 0
-        self.last_feedback = np.zeros((self.word_length,), dtype=np.int32)
-        self.alphabet_status = np.zeros((26,), dtype=np.int32)
-        self.guess_history = []
-        self.feedback_history = []
+        self.last_feedback = np.zeros((self.word_length,), dtype=np.uint8)
+        self.alphabet_status = np.zeros((26,), dtype=np.uint8)
+        # fixed size, so recording a guess never allocates.
+        # the first current_guess_count rows belong to the current game
+        self.guess_history = [None] * self.max_guesses
+        self.feedback_history = np.zeros((self.max_guesses, self.word_length), dtype=np.uint8)
 
-    def _letter_to_int(self, letter):
-        """Converts a lowercase letter 'a'-'z' to an integer 0-25"""
-        return ord(letter) - ord('a')
+    def _build_feedback_table(self):
+        """Computes the feedback table for this environment's words"""
+        return build_feedback_table(self.word_codes)
 
     def _int_to_letter(self, val):
         """Converts an integer 0-25 to a lowercase letter 'a'-'z'"""
         return chr(val + ord('a'))
 
     def _get_obs(self):
-        """Return the current state of the agent"""
+        """Return the current state of the agent.
+        The arrays are not copied, they change in place on the next step of the same game
+        (the vectorized env copies them). reset starts new arrays, so the last observation
+        of a finished game (e.g. sb3's terminal_observation) stays as it was"""
         return {
-            "last_feedback": self.last_feedback.copy(),
-            "alphabet_status": self.alphabet_status.copy(),
+            "last_feedback": self.last_feedback,
+            "alphabet_status": self.alphabet_status,
             "guesses_remaining": self.max_guesses - self.current_guess_count
         }
 
@@ -98,7 +297,7 @@ class WordleEnv(gym.Env):
         return {
             "secret_word": self.secret_word,
             "guesses_made": self.current_guess_count,
-            "guess_history": self.guess_history
+            "guess_history": self.guess_history[:self.current_guess_count]
         }
 
     def reset(self, seed=None, options=None):
@@ -106,16 +305,16 @@ class WordleEnv(gym.Env):
         super().reset(seed=seed)
 
         # pick a new secret word
-        self.secret_word = self.np_random.choice(self.word_list)
+        self.secret_idx = int(self.np_random.integers(self.num_words))
+        self.secret_word = self.word_list[self.secret_idx]
         
         # reset game state
         self.current_guess_count = 0
-        self.last_feedback = np.zeros((self.word_length,), dtype=np.int32)
-        self.alphabet_status = np.zeros((26,), dtype=np.int32)
-        self.guess_history = []
-        self.feedback_history = []
+        # new arrays, the old ones may still be held as the finished game's last observation
+        self.last_feedback = np.zeros((self.word_length,), dtype=np.uint8)
+        self.alphabet_status = np.zeros((26,), dtype=np.uint8)
         
-        if self.render_mode == "human":
+        if self.render_mode == "human" and not self._render_at_episode_end_only:
             self._render_frame()
 
         return self._get_obs(), self._get_info()
@@ -126,60 +325,34 @@ class WordleEnv(gym.Env):
         if self.current_guess_count >= self.max_guesses:
             return self._get_obs(), 0, True, False, self._get_info()
 
-        # converting the agent's action index back into a word string
-        guess_word = self.word_list[action]
         self.current_guess_count += 1
         
-        # calculate feedback (core wordle logic)
-        feedback = np.full((self.word_length,), self.GRAY, dtype=np.int32)
-        secret_counts = Counter(self.secret_word)
-        
-        # pass for greens
-        for i in range(self.word_length):
-            if guess_word[i] == self.secret_word[i]:
-                feedback[i] = self.GREEN
-                secret_counts[guess_word[i]] -= 1
-                self.alphabet_status[self._letter_to_int(guess_word[i])] = self.GREEN
-
-        # pass for yellows and grays
-        # we do this second so we don't double count letters that are already green
-        for i in range(self.word_length):
-            if feedback[i] == self.GREEN:
-                continue
-
-            letter = guess_word[i]
-            lti = self._letter_to_int(letter)
-
-            if letter in self.secret_word and secret_counts[letter] > 0:
-                feedback[i] = self.YELLOW
-                secret_counts[letter] -= 1
-                # only update the alphabet to yellow if it's not already green
-                if self.alphabet_status[lti] != self.GREEN:
-                    self.alphabet_status[lti] = self.YELLOW
-            else:
-                # if it's not green or yellow, it's gray (unused)
-                if self.alphabet_status[lti] == self.EMPTY:
-                    self.alphabet_status[lti] = self.GRAY
+        # look up the feedback (core wordle logic is precomputed in the table)
+        feedback = self.feedback_table[action, self.secret_idx]
+
+        # update the alphabet, a letter's status only goes up (EMPTY < GRAY < YELLOW < GREEN)
+        # so green stays green and gray only replaces empty
+        np.maximum.at(self.alphabet_status, self.word_codes[action], feedback)
         
         # saving the feedback for the next observation
-        self.last_feedback = feedback
-        self.guess_history.append(guess_word)
-        self.feedback_history.append(feedback)
+        self.last_feedback[:] = feedback
+        # recorded even when not rendering, so render() also works
+        # if render_mode is switched on in the middle of a game
+        # converting the agent's action index back into a word string
+        self.guess_history[self.current_guess_count - 1] = self.word_list[action]
+        self.feedback_history[self.current_guess_count - 1] = feedback
 
         # >>> calculate Reward and Termination <<<
-        terminated = False
-        reward = -0.1  # small penalty for each guess to encourage speed
-
-        if guess_word == self.secret_word:
-            terminated = True
-            reward = 1.0  # big reward for winning
-        elif self.current_guess_count == self.max_guesses:
-            terminated = True
-            reward = -1.0 # big penalty for losing
+        # the guess is right when its index is the secret's index, no need to compare strings
+        won = bool(action == self.secret_idx)
+        last_guess = self.current_guess_count == self.max_guesses
+        terminated, reward = self._reward_table[(won, last_guess)]
 
         truncated = False # this env doesn't have a time limit, just a game-end condition
         
-        if self.render_mode == "human":
+        if self.render_mode == "human" and (
+            terminated or truncated or not self._render_at_episode_end_only
+        ):
             self._render_frame()
 
         return self._get_obs(), reward, terminated, truncated, self._get_info()
@@ -191,50 +364,45 @@ class WordleEnv(gym.Env):
 
     def _render_frame(self):
         """Internal helper for rendering to console.
-        Printing the game board with colors to the terminal"""
-        print("\n" + "="*30)
-        print(f"Guess {self.current_guess_count} of {self.max_guesses}")
-        print("-" * 30)
+        Printing the game board with colors to the terminal (in a single write)"""
+        tiles = self._tiles
+        lines = [b"", b"=" * 30, f"Guess {self.current_guess_count} of {self.max_guesses}".encode(), b"-" * 30]
 
-        for i in range(len(self.guess_history)):
+        for i in range(self.current_guess_count):
             guess = self.guess_history[i]
             feedback = self.feedback_history[i]
-            
-            render_str = ""
-            for j in range(self.word_length):
-                letter = guess[j].upper()
-                if feedback[j] == self.GREEN:
-                    render_str += f"{bcolors.GREEN}{letter}{bcolors.ENDC} "
-                elif feedback[j] == self.YELLOW:
-                    render_str += f"{bcolors.YELLOW}{letter}{bcolors.ENDC} "
-                else: # GRAY
-                    render_str += f"{bcolors.GRAY}{letter}{bcolors.ENDC} "
-            print(f"  {render_str}")
-        
-        # print empty slots
-        for _ in range(self.max_guesses - len(self.guess_history)):
-            print("  " + "_ " * self.word_length)
+            lines.append(b"  " + b"".join(
+                [tiles[status][ord(letter) - ord('a')] for letter, status in zip(guess, feedback)]
+            ))
         
-        print("-" * 30)
-        print("Alphabet Status:")
+        # empty slots
+        for _ in range(self.max_guesses - self.current_guess_count):
+            lines.append(b"  " + b"_ " * self.word_length)
         
-        alphabet_render = ""
-        for i in range(26):
-            letter = self._int_to_letter(i).upper()
-            status = self.alphabet_status[i]
-            if status == self.GREEN:
-                alphabet_render += f"{bcolors.GREEN}{letter}{bcolors.ENDC} "
-            elif status == self.YELLOW:
-                alphabet_render += f"{bcolors.YELLOW}{letter}{bcolors.ENDC} "
-            elif status == self.GRAY:
-                alphabet_render += f"{bcolors.GRAY}{letter}{bcolors.ENDC} "
-            else: # UNUSED
-                alphabet_render += f"{letter} "
-            if letter == 'M':
-                alphabet_render += "\n"
-        print(alphabet_render)
-        print("="*30)
+        lines.append(b"-" * 30)
+        lines.append(b"Alphabet Status:")
+
+        # each cell is looked up by the letter's status, the keyboard is split after M
+        cells = [tiles[status][i] for i, status in enumerate(self.alphabet_status)]
+        lines.append(b"".join(cells[:13]))
+        lines.append(b"".join(cells[13:]))
+        lines.append(b"=" * 30 + b"\n")
+        frame = b"\n".join(lines)
+
+        # writing the bytes straight to the binary stream, after anything already printed
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None: # e.g. notebooks, where stdout is text only
+            sys.stdout.write(frame.decode())
+            sys.stdout.flush()
+        else:
+            sys.stdout.flush()
+            buffer.write(frame)
+            buffer.flush()
 
     def close(self):
         """Cleans up the environment"""
-        pass
+        if self._shared_table is not None:
+            # the view has to go before the shared memory can be closed
+            self.feedback_table = None
+            self._shared_table.close()
+            self._shared_table = None
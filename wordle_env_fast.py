@@ -0,0 +1,87 @@
+import numpy as np
+from numba import njit
+
+from wordle_env import WordleEnv, _GRAY, _YELLOW, _GREEN
+
+
+@njit(cache=True)
+def _score5(guess, secret, counts, out):
+    """Same as wordle_env._score but only for 5 letter words, with the loops written out.
+    counts is a scratch int8 array of 26 zeros, it is left as zeros again at the end"""
+    counts[secret[0]] += 1
+    counts[secret[1]] += 1
+    counts[secret[2]] += 1
+    counts[secret[3]] += 1
+    counts[secret[4]] += 1
+
+    # pass for greens
+    g0 = guess[0] == secret[0]
+    g1 = guess[1] == secret[1]
+    g2 = guess[2] == secret[2]
+    g3 = guess[3] == secret[3]
+    g4 = guess[4] == secret[4]
+    counts[guess[0]] -= g0
+    counts[guess[1]] -= g1
+    counts[guess[2]] -= g2
+    counts[guess[3]] -= g3
+    counts[guess[4]] -= g4
+
+    # pass for yellows and grays
+    out[0] = _GREEN if g0 else _GRAY
+    out[1] = _GREEN if g1 else _GRAY
+    out[2] = _GREEN if g2 else _GRAY
+    out[3] = _GREEN if g3 else _GRAY
+    out[4] = _GREEN if g4 else _GRAY
+    if not g0 and counts[guess[0]] > 0:
+        out[0] = _YELLOW
+        counts[guess[0]] -= 1
+    if not g1 and counts[guess[1]] > 0:
+        out[1] = _YELLOW
+        counts[guess[1]] -= 1
+    if not g2 and counts[guess[2]] > 0:
+        out[2] = _YELLOW
+        counts[guess[2]] -= 1
+    if not g3 and counts[guess[3]] > 0:
+        out[3] = _YELLOW
+        counts[guess[3]] -= 1
+    if not g4 and counts[guess[4]] > 0:
+        out[4] = _YELLOW
+        counts[guess[4]] -= 1
+
+    # clearing the scratch counts for the next call
+    counts[secret[0]] = 0
+    counts[secret[1]] = 0
+    counts[secret[2]] = 0
+    counts[secret[3]] = 0
+    counts[secret[4]] = 0
+
+
+@njit(cache=True)
+def _fill_feedback_table5(word_codes, table):
+    """Scores every word against every other word, table[guess, secret] = feedback"""
+    counts = np.zeros(26, dtype=np.int8)
+    for g in range(word_codes.shape[0]):
+        for s in range(word_codes.shape[0]):
+            _score5(word_codes[g], word_codes[s], counts, table[g, s])
+
+
+# compiling once at import so the first environment doesn't pay for it
+_fill_feedback_table5(np.zeros((1, 5), dtype=np.uint8), np.zeros((1, 1, 5), dtype=np.uint8))
+
+
+class WordleEnv5(WordleEnv):
+    """
+    WordleEnv for the standard game (5 letter words, 6 guesses),
+    using the scorer specialized for 5 letters to build the feedback table.
+    """
+
+    def __init__(self, custom_words=None, render_mode=None, **kwargs):
+        """Takes the same arguments as WordleEnv (word_codes, shared_table_name, ...),
+        except word_length and max_guesses which are fixed"""
+        super().__init__(custom_words, word_length=5, max_guesses=6, render_mode=render_mode, **kwargs)
+
+    def _build_feedback_table(self):
+        table = np.empty((self.num_words, self.num_words, 5), dtype=np.uint8)
+        _fill_feedback_table5(self.word_codes, table)
+        table.flags.writeable = False
+        return table